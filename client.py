@@ -1,9 +1,43 @@
 """
 Client for interacting with the Bizim Transfer API.
 """
+import time
+
 import httpx
+import msgspec
+import orjson
+from async_lru import alru_cache
 from typing import Dict, Any, List, Optional, Union
 
+from models import TransferSearchResult
+
+# Request bodies are pre-encoded with orjson, so the content type is set
+# explicitly; a prebuilt Headers object skips per-request normalization
+JSON_HEADERS = httpx.Headers({"Content-Type": "application/json"})
+
+_search_result_decoder = msgspec.json.Decoder(TransferSearchResult)
+
+# Circuit breaker for the upstream API: after repeated failures in a short
+# window, requests fail fast instead of each waiting out the HTTP timeout
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_FAILURE_WINDOW = 10.0
+BREAKER_COOLDOWN = 30.0
+
+
+class UnexpectedResponseError(Exception):
+    """Raised when the API answers successfully with an unusable payload."""
+
+
+class ServiceUnavailableError(Exception):
+    """Raised while the circuit breaker is open."""
+
+
+def _is_upstream_failure(error: Exception) -> bool:
+    """Whether an error means the API itself is unhealthy (not a bad request)."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
 
 class BizimTransferClient:
     """Client for communicating with the Bizim Transfer REST API."""
@@ -24,12 +58,105 @@ class BizimTransferClient:
         """
         self.base_url = base_url
         self.auth = (username, password)
-        self.client = httpx.AsyncClient(auth=self.auth)
+        
+        # Keep connections warm across tool calls so concurrent requests
+        # reuse the pool instead of paying a TCP/TLS handshake each time
+        limits = httpx.Limits(
+            max_connections=100,
+            max_keepalive_connections=50,
+            keepalive_expiry=60.0
+        )
+        transport = httpx.AsyncHTTPTransport(retries=1, http2=True, limits=limits)
+        self.client = httpx.AsyncClient(
+            auth=self.auth,
+            base_url=base_url,
+            transport=transport,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            headers={"Accept-Encoding": "gzip"}
+        )
+        
+        # Absolute endpoint URLs, parsed once, so httpx does not merge and
+        # re-parse the path against base_url on every request
+        api_root = self.client.base_url
+        self._query_url = api_root.join("query")
+        self._reservation_url = api_root.join("reservation")
+        self._list_url = api_root.join("list")
+        self._places_url = api_root.join("places")
+        self._place_detail_url = api_root.join("places/detail")
+        
+        # Circuit breaker state; open_until stays set after the cooldown so
+        # the first request afterwards is treated as a half-open trial, and
+        # other requests keep failing fast until that trial finishes
+        self._failures = 0
+        self._window_start = 0.0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+        
+        # Place lookups are low-cardinality and stable, so repeated queries
+        # are answered from a per-client TTL cache instead of the network
+        self.search_places = alru_cache(maxsize=1024, ttl=3600)(self._search_places)
+        self.get_place_details = alru_cache(maxsize=1024, ttl=3600)(self._get_place_details)
     
     async def close(self):
         """Close the HTTP client."""
         await self.client.aclose()
     
+    async def _send(self, method: str, url: httpx.URL, **kwargs: Any) -> httpx.Response:
+        """
+        Send a request through the circuit breaker.
+        
+        Only network requests pass through here, so cached place lookups
+        are still answered while the breaker is open.
+        
+        Args:
+            method: HTTP method
+            url: Absolute endpoint URL
+            **kwargs: Extra arguments for httpx.AsyncClient.request
+            
+        Returns:
+            The successful response
+            
+        Raises:
+            ServiceUnavailableError: If the breaker is open or a half-open
+                trial request is already in flight
+        """
+        trial = False
+        if self._open_until:
+            if self._trial_in_flight or time.monotonic() < self._open_until:
+                raise ServiceUnavailableError("Service temporarily unavailable, please try again shortly")
+            # Cooldown is over: this request alone probes the API
+            self._trial_in_flight = trial = True
+        
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            if _is_upstream_failure(e):
+                self._record_failure()
+            raise
+        finally:
+            if trial:
+                self._trial_in_flight = False
+        
+        self._failures = 0
+        self._open_until = 0.0
+        return response
+    
+    def _record_failure(self) -> None:
+        """Count an upstream failure and open the breaker when due."""
+        now = time.monotonic()
+        if self._open_until:
+            # Half-open trial failed: reopen without waiting for a new streak
+            self._open_until = now + BREAKER_COOLDOWN
+            return
+        
+        if now - self._window_start > BREAKER_FAILURE_WINDOW:
+            self._window_start = now
+            self._failures = 0
+        self._failures += 1
+        if self._failures >= BREAKER_FAILURE_THRESHOLD:
+            self._open_until = now + BREAKER_COOLDOWN
+    
     async def search_transfers(
         self,
         pickup: str,
@@ -48,7 +175,7 @@ class BizimTransferClient:
         requesttype: int = 1,
         currencyid: int = 1,
         language: str = "en"
-    ) -> Dict[str, Any]:
+    ) -> TransferSearchResult:
         """
         Search for available transfers.
         
@@ -71,8 +198,10 @@ class BizimTransferClient:
             language: Language code (tr, en, de, ru)
             
         Returns:
-            API response with available transfer options
+            Decoded API response with available transfer options
         """
+        # A dict literal handed to orjson in one call encodes faster than
+        # splicing per-field encodings into a prebuilt JSON template
         payload = {
             "pickup": pickup,
             "pickuplat": pickuplat,
@@ -92,9 +221,13 @@ class BizimTransferClient:
             "language": language
         }
         
-        response = await self.client.post(f"{self.base_url}/query", json=payload)
-        response.raise_for_status()
-        return response.json()
+        response = await self._send(
+            "POST",
+            self._query_url,
+            content=orjson.dumps(payload),
+            headers=JSON_HEADERS
+        )
+        return _search_result_decoder.decode(response.content)
     
     async def make_reservation(
         self,
@@ -134,9 +267,13 @@ class BizimTransferClient:
             "passangers": passangers
         }
         
-        response = await self.client.post(f"{self.base_url}/reservation", json=payload)
-        response.raise_for_status()
-        return response.json()
+        response = await self._send(
+            "POST",
+            self._reservation_url,
+            content=orjson.dumps(payload),
+            headers=JSON_HEADERS
+        )
+        return orjson.loads(response.content)
     
     async def list_reservations(
         self,
@@ -157,6 +294,7 @@ class BizimTransferClient:
         Returns:
             API response with reservation list
         """
+        payload: Dict[str, Any]
         if querytype in ["createdate", "flightdate"]:
             payload = {
                 "querytype": querytype,
@@ -169,11 +307,19 @@ class BizimTransferClient:
                 "reservationnumber": reservationnumber
             }
         
-        response = await self.client.post(f"{self.base_url}/list", json=payload)
-        response.raise_for_status()
-        return response.json()
+        response = await self._send(
+            "POST",
+            self._list_url,
+            content=orjson.dumps(payload),
+            headers=JSON_HEADERS
+        )
+        return orjson.loads(response.content)
     
-    async def search_places(self, query: str, language: str = "en") -> List[Dict[str, str]]:
+    async def _search_places(
+        self,
+        query: str,
+        language: str = "en"
+    ) -> Union[List[Dict[str, str]], Dict[str, Any]]:
         """
         Search for places.
         
@@ -182,16 +328,27 @@ class BizimTransferClient:
             language: Language code
             
         Returns:
-            List of places matching the query
+            List of places matching the query, or a dict holding them
+            under "results"
+            
+        Raises:
+            UnexpectedResponseError: If the payload holds no place list
         """
-        response = await self.client.get(
-            f"{self.base_url}/places",
+        response = await self._send(
+            "GET",
+            self._places_url,
             params={"query": query, "language": language}
         )
-        response.raise_for_status()
-        return response.json()
+        places = orjson.loads(response.content)
+        
+        # Raise rather than return error payloads so they are not cached
+        if isinstance(places, list) or (
+            isinstance(places, dict) and isinstance(places.get("results"), list)
+        ):
+            return places
+        raise UnexpectedResponseError(f"Unexpected places response: {places!r:.300}")
     
-    async def get_place_details(self, place_id: str, language: str = "en") -> Dict[str, Any]:
+    async def _get_place_details(self, place_id: str, language: str = "en") -> Dict[str, Any]:
         """
         Get details for a specific place.
         
@@ -201,10 +358,18 @@ class BizimTransferClient:
             
         Returns:
             Place details
+            
+        Raises:
+            UnexpectedResponseError: If the payload is not a successful result
         """
-        response = await self.client.get(
-            f"{self.base_url}/places/detail",
+        response = await self._send(
+            "GET",
+            self._place_detail_url,
             params={"place_id": place_id, "language": language}
         )
-        response.raise_for_status()
-        return response.json()
\ No newline at end of file
+        details = orjson.loads(response.content)
+        
+        # Raise rather than return error payloads so they are not cached
+        if isinstance(details, dict) and details.get("status", "success") in ("success", "OK"):
+            return details
+        raise UnexpectedResponseError(f"Unexpected place details response: {details!r:.300}")
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+Typed response models for the Bizim Transfer API.
+"""
+from typing import Any, List, TypeVar, Union
+
+import msgspec
+
+T = TypeVar("T")
+
+# The API sends an empty array as "", false or 0 in some responses
+EmptyArray = Union[str, int, bool, None]
+
+
+def as_list(value: Union[List[T], EmptyArray]) -> List[T]:
+    """
+    Normalize a tolerant array field to a list.
+    
+    Args:
+        value: Decoded array field, or one of the API's empty-array stand-ins
+        
+    Returns:
+        The list itself, or an empty list for any non-list value
+    """
+    return value if isinstance(value, list) else []
+
+
+class TransferExtra(msgspec.Struct):
+    """Optional extra (baby seat, etc.) offered with a transfer option."""
+    name: Any = msgspec.field(default=None, name="UrunTanimi")
+    unit_price: Any = msgspec.field(default=None, name="BirimFiyat")
+
+
+class TransferOption(msgspec.Struct):
+    """A single vehicle offer for one way of a transfer search."""
+    carname: Any = None
+    extramessage: Any = "Standard"
+    pickup: Any = None
+    duration: Any = None
+    price: Any = None
+    kisihakki: Any = None
+    bavulhakki: Any = None
+    extraurunler: Union[List[TransferExtra], EmptyArray] = None
+    routeid: Any = None
+    subrouteid: Any = None
+
+
+class TransferWay(msgspec.Struct):
+    """One direction (outbound or return) of a transfer search."""
+    type: Any = ""
+    from_: Any = msgspec.field(default=None, name="from")
+    to: Any = None
+    date: Any = None
+    options: Union[List[TransferOption], EmptyArray] = msgspec.field(default=None, name="list")
+
+
+class TransferSearchResult(msgspec.Struct):
+    """
+    Response of the /query endpoint.
+    
+    Every field has a default, so error responses (which carry only
+    status and description) decode into the same type. Scalars are only
+    interpolated into output and the API types them loosely, so they are
+    left as Any; only the array containers are typed.
+    """
+    status: Any = None
+    description: Any = None
+    uuid: Any = None
+    pickup: Any = None
+    dropoff: Any = None
+    adult: Any = None
+    child: Any = None
+    infant: Any = None
+    currencysembol: Any = ""
+    ways: Union[List[TransferWay], EmptyArray] = None
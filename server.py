@@ -6,13 +6,15 @@ from contextlib import asynccontextmanager
 from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 from mcp.server.fastmcp import FastMCP, Context
+from pydantic import BaseModel, ConfigDict
 
 from client import BizimTransferClient
+from models import TransferSearchResult, as_list
 from utils import (
-    CURRENCY_MAP,
+    CURRENCY_LOOKUP,
     validate_date,
     validate_time,
     format_transfer_results,
@@ -25,7 +27,7 @@ from utils import (
 # Create MCP server with a descriptive name
 mcp = FastMCP("BizimTransfer")
 
-@dataclass
+@dataclass(slots=True)
 class AppContext:
     client: BizimTransferClient
 
@@ -45,6 +47,116 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
 # Pass lifespan to server
 mcp = FastMCP("BizimTransfer", lifespan=app_lifespan)
 
+# Use uvloop's faster event loop where it is available. Installed at import
+# so it also applies when `mcp run`/`mcp dev` import this module and call
+# mcp.run() themselves
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+# Responses larger than these are formatted in a worker thread so that
+# string building does not stall other tool calls on the event loop
+OFFLOAD_TRANSFER_OPTIONS = 16
+OFFLOAD_RESERVATIONS = 32
+
+async def _format_transfers(result: TransferSearchResult) -> str:
+    """Format transfer search results, off the event loop if large."""
+    option_count = sum(len(as_list(way.options)) for way in as_list(result.ways))
+    if option_count > OFFLOAD_TRANSFER_OPTIONS:
+        return await asyncio.to_thread(format_transfer_results, result)
+    return format_transfer_results(result)
+
+async def _format_reservations(result: Dict[str, Any]) -> str:
+    """Format a reservation list, off the event loop if large."""
+    if len(result.get("list") or []) > OFFLOAD_RESERVATIONS:
+        return await asyncio.to_thread(format_reservation_list, result)
+    return format_reservation_list(result)
+
+# Upper bound on trips per search_transfers_bulk call, so one batch
+# cannot flood the upstream API with concurrent searches
+MAX_BULK_TRIPS = 10
+
+class TripSpec(BaseModel):
+    """A single trip for search_transfers_bulk; fields match search_transfers."""
+    model_config = ConfigDict(extra="forbid")
+    
+    pickup_address: str
+    pickup_lat: float
+    pickup_lng: float
+    dropoff_address: str
+    dropoff_lat: float
+    dropoff_lng: float
+    pickup_date: str
+    pickup_time: str
+    adults: int
+    children: int = 0
+    infants: int = 0
+    round_trip: bool = False
+    return_date: Optional[str] = None
+    return_time: Optional[str] = None
+    currency: str = "EUR"
+    language: str = "en"
+
+def _prepare_transfer_search(trip: TripSpec) -> Tuple[Optional[str], Dict[str, Any]]:
+    """
+    Validate transfer search inputs and map them to client arguments.
+    
+    Args:
+        trip: Search parameters, as accepted by search_transfers
+    
+    Returns:
+        Tuple of (error message or None, keyword arguments for the client)
+    """
+    # Input validation
+    if not trip.pickup_address or not trip.dropoff_address:
+        return "Error: Pickup and dropoff addresses are required", {}
+    
+    if trip.adults < 1:
+        return "Error: At least one adult passenger is required", {}
+    
+    if not validate_date(trip.pickup_date):
+        return "Error: Invalid pickup date format. Please use YYYY-MM-DD format", {}
+    
+    if not validate_time(trip.pickup_time):
+        return "Error: Invalid pickup time format. Please use HH:MM format (24h)", {}
+    
+    # Return date and time are only sent for round trips, so one-way
+    # searches skip their validation entirely
+    if trip.round_trip:
+        if not trip.return_date or not trip.return_time:
+            return "Error: Return date and time are required for round trips", {}
+        if not validate_date(trip.return_date):
+            return "Error: Invalid return date format. Please use YYYY-MM-DD format", {}
+        if not validate_time(trip.return_time):
+            return "Error: Invalid return time format. Please use HH:MM format (24h)", {}
+    
+    # Get currency ID
+    currency_id = CURRENCY_LOOKUP.get(trip.currency) or CURRENCY_LOOKUP.get(trip.currency.upper(), 2)  # Default to EUR
+    
+    # Set request type (1 for one-way, 2 for round-trip)
+    request_type = 2 if trip.round_trip else 1
+    
+    return None, {
+        "pickup": trip.pickup_address,
+        "pickuplat": trip.pickup_lat,
+        "pickuplng": trip.pickup_lng,
+        "dropoff": trip.dropoff_address,
+        "dropofflat": trip.dropoff_lat,
+        "dropofflng": trip.dropoff_lng,
+        "adult": trip.adults,
+        "child": trip.children,
+        "infant": trip.infants,
+        "pickupdate": trip.pickup_date,
+        "pickuptime": trip.pickup_time,
+        "dropoffdate": trip.return_date if trip.round_trip else "",
+        "dropofftime": trip.return_time if trip.round_trip else "",
+        "requesttype": request_type,
+        "currencyid": currency_id,
+        "language": trip.language
+    }
+
 @mcp.tool()
 async def search_transfers(
     pickup_address: str,
@@ -90,65 +202,101 @@ async def search_transfers(
         Formatted search results with available transfer options
     """
     # Input validation
-    if not pickup_address or not dropoff_address:
-        return "Error: Pickup and dropoff addresses are required"
-    
-    if adults < 1:
-        return "Error: At least one adult passenger is required"
-    
-    if not validate_date(pickup_date):
-        return "Error: Invalid pickup date format. Please use YYYY-MM-DD format"
-    
-    if not validate_time(pickup_time):
-        return "Error: Invalid pickup time format. Please use HH:MM format (24h)"
-    
-    if round_trip:
-        if not return_date or not return_time:
-            return "Error: Return date and time are required for round trips"
-        if not validate_date(return_date):
-            return "Error: Invalid return date format. Please use YYYY-MM-DD format"
-        if not validate_time(return_time):
-            return "Error: Invalid return time format. Please use HH:MM format (24h)"
-    
-    # Get currency ID
-    currency_id = CURRENCY_MAP.get(currency.upper(), 2)  # Default to EUR
-    
-    # Set request type (1 for one-way, 2 for round-trip)
-    request_type = 2 if round_trip else 1
+    error, search_kwargs = _prepare_transfer_search(TripSpec(
+        pickup_address=pickup_address,
+        pickup_lat=pickup_lat,
+        pickup_lng=pickup_lng,
+        dropoff_address=dropoff_address,
+        dropoff_lat=dropoff_lat,
+        dropoff_lng=dropoff_lng,
+        pickup_date=pickup_date,
+        pickup_time=pickup_time,
+        adults=adults,
+        children=children,
+        infants=infants,
+        round_trip=round_trip,
+        return_date=return_date,
+        return_time=return_time,
+        currency=currency,
+        language=language
+    ))
+    if error:
+        return error
     
     try:
         # Get client from context
-        client = ctx.request_context.lifespan_context
+        api = ctx.request_context.lifespan_context.client
         
         # Log the request
         ctx.info(f"Searching transfers from {pickup_address} to {dropoff_address}")
         
         # Call the API
-        result = await client.client.search_transfers(
-            pickup=pickup_address,
-            pickuplat=pickup_lat,
-            pickuplng=pickup_lng,
-            dropoff=dropoff_address,
-            dropofflat=dropoff_lat,
-            dropofflng=dropoff_lng,
-            adult=adults,
-            child=children,
-            infant=infants,
-            pickupdate=pickup_date,
-            pickuptime=pickup_time,
-            dropoffdate=return_date if round_trip else "",
-            dropofftime=return_time if round_trip else "",
-            requesttype=request_type,
-            currencyid=currency_id,
-            language=language
-        )
+        result = await api.search_transfers(**search_kwargs)
         
         # Format and return the results
-        return format_transfer_results(result)
+        return await _format_transfers(result)
     
     except Exception as e:
         return f"Error searching for transfers: {str(e)}"
 
+@mcp.tool()
+async def search_transfers_bulk(
+    trips: List[TripSpec],
+    ctx: Context = None
+) -> str:
+    """
+    Search for transfers on several trips at once.
+    
+    Searches are sent to the API concurrently, so a batch takes about as
+    long as its slowest trip rather than the sum of all of them.
+    
+    Args:
+        trips: Trip specifications (at most 10), each with the same fields
+            as search_transfers
+    
+    Returns:
+        Formatted search results for every trip, in the order given
+    """
+    if not trips:
+        return "Error: At least one trip is required"
+    
+    if len(trips) > MAX_BULK_TRIPS:
+        return f"Error: At most {MAX_BULK_TRIPS} trips can be searched at once"
+    
+    # Validate every trip up front; invalid ones are reported, not sent
+    sections: List[Optional[str]] = []
+    pending = []
+    for trip in trips:
+        error, search_kwargs = _prepare_transfer_search(trip)
+        if error:
+            sections.append(error)
+        else:
+            sections.append(None)
+            pending.append((len(sections) - 1, search_kwargs))
+    
+    if pending:
+        # Get client from context
+        api = ctx.request_context.lifespan_context.client
+        
+        # Log the request
+        await ctx.info(f"Searching transfers for {len(pending)} trip(s)")
+        
+        # Call the API for all valid trips concurrently
+        results = await asyncio.gather(
+            *(api.search_transfers(**search_kwargs) for _, search_kwargs in pending),
+            return_exceptions=True
+        )
+        
+        for (index, _), result in zip(pending, results):
+            if isinstance(result, BaseException):
+                sections[index] = f"Error searching for transfers: {str(result)}"
+            else:
+                sections[index] = await _format_transfers(result)
+    
+    return "\n\n".join(
+        f"# Trip {i}\n{section}" for i, section in enumerate(sections, 1)
+    )
+
 @mcp.tool()
 async def make_reservation(
     uuid: str,
@@ -231,39 +379,37 @@ async def make_reservation(
             "notes": return_notes or ""
         })
     
+    # API expects lowercase country codes; clients usually send them that way
+    customer_country = country_code if country_code.islower() else country_code.lower()
+    
     # Prepare passengers list
-    passengers = []
     if passenger_names and passenger_countries:
         if len(passenger_names) != len(passenger_countries):
             return "Error: Number of passenger names and countries must match"
         
-        for i, (name, country) in enumerate(zip(passenger_names, passenger_countries)):
-            passengers.append({
-                "name": name,
-                "country": country.lower()
-            })
+        passengers = [
+            {"name": name, "country": country if country.islower() else country.lower()}
+            for name, country in zip(passenger_names, passenger_countries)
+        ]
     else:
         # Default to main customer if no specific passengers
-        passengers.append({
-            "name": f"{first_name} {last_name}",
-            "country": country_code.lower()
-        })
+        passengers = [{"name": f"{first_name} {last_name}", "country": customer_country}]
     
     try:
         # Get client from context
-        client = ctx.request_context.lifespan_context
+        api = ctx.request_context.lifespan_context.client
         
         # Log the request
         ctx.info(f"Making reservation for {first_name} {last_name}")
         
         # Call the API
-        result = await client.client.make_reservation(
+        result = await api.make_reservation(
             uuid=uuid,
             customername=first_name,
             customersurname=last_name,
             customeremail=email,
             customertelephone=phone,
-            customercoutry=country_code.lower(),
+            customercoutry=customer_country,
             transferway=transfer_ways,
             passangers=passengers
         )
@@ -309,26 +455,26 @@ async def list_reservations(
     
     try:
         # Get client from context
-        client = ctx.request_context.lifespan_context
+        api = ctx.request_context.lifespan_context.client
         
         # Log the request
         ctx.info(f"Listing reservations with {query_type}")
         
         # Call the API
         if query_type in ["createdate", "flightdate"]:
-            result = await client.client.list_reservations(
+            result = await api.list_reservations(
                 querytype=query_type,
                 start=start_date,
                 end=end_date
             )
         else:  # reservationnumber
-            result = await client.client.list_reservations(
+            result = await api.list_reservations(
                 querytype=query_type,
                 reservationnumber=reservation_number
             )
         
         # Format and return the results
-        return format_reservation_list(result)
+        return await _format_reservations(result)
     
     except Exception as e:
         return f"Error listing reservations: {str(e)}"
@@ -355,13 +501,13 @@ async def search_places(
         return "Error: Server configuration error - missing context"
     try:
         # Get client from context
-        client = ctx.request_context.lifespan_context
+        api = ctx.request_context.lifespan_context.client
         
         # Log the request
         ctx.info(f"Searching places for '{query}'")
         
         # Call the API
-        places = await client.client.search_places(query, language)
+        places = await api.search_places(query, language)
         
         # Format and return the results
         return format_places_results(places)
@@ -390,13 +536,13 @@ async def get_place_details(
     
     try:
         # Get client from context
-        client = ctx.request_context.lifespan_context
+        api = ctx.request_context.lifespan_context.client
         
         # Log the request
         ctx.info(f"Getting details for place ID {place_id}")
         
         # Call the API
-        details = await client.client.get_place_details(place_id, language)
+        details = await api.get_place_details(place_id, language)
         
         # Format and return the results
         return format_place_details(details)
@@ -407,7 +553,7 @@ async def get_place_details(
 
 if __name__ == "__main__":
     import sys
-        
+    
     # Default to stdio transport if no arguments provided
     transport = "stdio"
     port = 8100
@@ -0,0 +1,18 @@
+"""
+Optional native build of the formatting helpers.
+
+Compiles src/utils.py with mypyc into an extension module placed next to
+it; the import is unchanged and falls back to the pure-Python module when
+no build is present:
+
+    pip install mypy
+    python setup.py build_ext --inplace
+"""
+from setuptools import setup
+from mypyc.build import mypycify
+
+setup(
+    py_modules=[],
+    package_dir={"": "src"},
+    ext_modules=mypycify(["src/utils.py"]),
+)
@@ -1,8 +1,12 @@
 """
 Utility functions for the Bizim Transfer MCP server.
 """
+import re
 from datetime import datetime
-from typing import Dict, Union, Optional, Any, List
+from functools import lru_cache
+from typing import Dict, Union, Optional, Any, Iterator, List
+
+from models import TransferSearchResult, as_list
 
 # Currency mapping
 CURRENCY_MAP = {
@@ -13,6 +17,16 @@ CURRENCY_MAP = {
     "RUB": 6
 }
 
+# Case-insensitive view of CURRENCY_MAP; canonical upper- and lower-case
+# codes resolve without allocating a new string
+CURRENCY_LOOKUP = {**CURRENCY_MAP, **{code.lower(): currency_id for code, currency_id in CURRENCY_MAP.items()}}
+
+# Precompiled patterns for the validators; fullmatch avoids strptime's
+# per-call format parsing on the hot path
+_DATE_RE = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})")
+_TIME_RE = re.compile(r"([0-9]{2}):([0-9]{2})")
+
+@lru_cache(maxsize=1024)
 def validate_date(date_str: str) -> bool:
     """
     Validate a date string in YYYY-MM-DD format.
@@ -23,14 +37,23 @@ def validate_date(date_str: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    try:
-        if not date_str:
-            return True  # Empty string is valid (for optional dates)
-        datetime.strptime(date_str, "%Y-%m-%d")
-        return True
-    except ValueError:
+    if not date_str:
+        return True  # Empty string is valid (for optional dates)
+    match = _DATE_RE.fullmatch(date_str)
+    if not match:
+        return False
+    year, month, day = map(int, match.groups())
+    if year < 1 or not 1 <= month <= 12 or not 1 <= day <= 31:
         return False
+    if day > 28:
+        # Only month-end dates need the calendar check (e.g. 2023-02-30)
+        try:
+            datetime(year, month, day)
+        except ValueError:
+            return False
+    return True
 
+@lru_cache(maxsize=1024)
 def validate_time(time_str: str) -> bool:
     """
     Validate a time string in HH:MM format.
@@ -41,15 +64,15 @@ def validate_time(time_str: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    try:
-        if not time_str:
-            return True  # Empty string is valid (for optional times)
-        datetime.strptime(time_str, "%H:%M")
-        return True
-    except ValueError:
+    if not time_str:
+        return True  # Empty string is valid (for optional times)
+    match = _TIME_RE.fullmatch(time_str)
+    if not match:
         return False
+    hour, minute = map(int, match.groups())
+    return hour < 24 and minute < 60
 
-def format_transfer_results(result: Dict[str, Any]) -> str:
+def format_transfer_results(result: TransferSearchResult) -> str:
     """
     Format transfer search results into a readable string.
     
@@ -59,54 +82,68 @@ def format_transfer_results(result: Dict[str, Any]) -> str:
     Returns:
         Formatted string with transfer options
     """
-    if result.get("status") != "success":
-        return f"Error: {result.get('description', 'Unknown error occurred')}"
+    if result.status != "success":
+        return f"Error: {result.description or 'Unknown error occurred'}"
+    
+    return "\n".join(_iter_transfer_lines(result))
+
+def _iter_transfer_lines(result: TransferSearchResult) -> Iterator[str]:
+    """
+    Yield the blocks of a formatted transfer search response.
     
-    response_parts = []
+    Each block may span several lines; a trailing newline stands in for
+    the blank separator line once the blocks are joined.
     
-    # Add header
-    currency_symbol = result.get("currencysembol", "")
-    response_parts.append(f"Transfer options from {result.get('pickup')} to {result.get('dropoff')}")
-    response_parts.append(f"Total passengers: {result.get('adult')} adults, {result.get('child')} children, {result.get('infant')} infants")
-    response_parts.append("")  # Empty line
+    Args:
+        result: Successful API response from search_transfers
+        
+    Yields:
+        Formatted text blocks
+    """
+    # Shared by every price line in the response
+    price_suffix = f" {result.currencysembol}"
     
-    # Add UUID for later use in booking
-    response_parts.append(f"Booking reference (UUID): {result.get('uuid')}")
-    response_parts.append("")  # Empty line
+    # Header, plus the UUID needed later for booking
+    yield (
+        f"Transfer options from {result.pickup} to {result.dropoff}\n"
+        f"Total passengers: {result.adult} adults, {result.child} children, {result.infant} infants\n"
+        f"\n"
+        f"Booking reference (UUID): {result.uuid}\n"
+    )
     
     # Process each way
-    ways = result.get("ways", [])
-    for way in ways:
-        way_type = "Outbound" if way.get("type", "").startswith("yon1") else "Return"
-        response_parts.append(f"## {way_type} Journey")
-        response_parts.append(f"From: {way.get('from')}")
-        response_parts.append(f"To: {way.get('to')}")
-        response_parts.append(f"Date: {way.get('date')}")
-        response_parts.append("")
+    for way in as_list(result.ways):
+        way_type = "Outbound" if str(way.type or "").startswith("yon1") else "Return"
+        yield (
+            f"## {way_type} Journey\n"
+            f"From: {way.from_}\n"
+            f"To: {way.to}\n"
+            f"Date: {way.date}\n"
+        )
         
         # Process transfer options
-        options = way.get("list", [])
-        for i, option in enumerate(options, 1):
-            response_parts.append(f"### Option {i}: {option.get('carname')}")
-            response_parts.append(f"Type: {option.get('extramessage', 'Standard')}")
-            response_parts.append(f"Pickup Time: {option.get('pickup')}")
-            response_parts.append(f"Duration: {option.get('duration')} minutes")
-            response_parts.append(f"Price: {option.get('price')} {currency_symbol}")
-            response_parts.append(f"Max Passengers: {option.get('kisihakki')} with {option.get('bavulhakki')} luggage items")
+        for i, option in enumerate(as_list(way.options), 1):
+            yield (
+                f"### Option {i}: {option.carname}\n"
+                f"Type: {option.extramessage}\n"
+                f"Pickup Time: {option.pickup}\n"
+                f"Duration: {option.duration} minutes\n"
+                f"Price: {option.price}{price_suffix}\n"
+                f"Max Passengers: {option.kisihakki} with {option.bavulhakki} luggage items"
+            )
             
             # Add extras if available
-            extras = option.get("extraurunler", [])
+            extras = as_list(option.extraurunler)
             if extras:
-                response_parts.append("Available Extras:")
+                yield "Available Extras:"
                 for extra in extras:
-                    response_parts.append(f"- {extra.get('UrunTanimi')}: {extra.get('BirimFiyat')} {currency_symbol}")
+                    yield f"- {extra.name}: {extra.unit_price}{price_suffix}"
             
             # Add booking reference IDs
-            response_parts.append(f"Route ID: {option.get('routeid')}")
-            response_parts.append(f"Subroute ID: {option.get('subrouteid')} (needed for booking)")
-            response_parts.append("")
-    
-    return "\n".join(response_parts)
+            yield (
+                f"Route ID: {option.routeid}\n"
+                f"Subroute ID: {option.subrouteid} (needed for booking)\n"
+            )
 
 def format_reservation_results(result: Dict[str, Any]) -> str:
     """
@@ -149,35 +186,42 @@ def format_reservation_list(result: Dict[str, Any]) -> str:
         return "No reservations found matching your criteria."
     
     response_parts = [f"Found {len(reservations)} reservation(s):"]
+    append = response_parts.append
     
     for i, res in enumerate(reservations, 1):
-        response_parts.append(f"\n## Reservation {i}")
-        response_parts.append(f"Reservation Number: {res.get('reservationnumber')}")
-        response_parts.append(f"Customer: {res.get('customername')} {res.get('customersurname')}")
-        response_parts.append(f"Contact: {res.get('customeremail')}, {res.get('customertel')}")
-        response_parts.append(f"Passengers: {res.get('adult')} adults, {res.get('child')} children, {res.get('infant')} infants")
-        response_parts.append(f"Amount: {res.get('Amount')} {res.get('currency')}")
-        response_parts.append(f"Status: {res.get('status')}")
-        response_parts.append(f"Payment: {res.get('paymenttype')}")
-        response_parts.append(f"Created: {res.get('createat')}")
+        get = res.get
+        append(
+            f"\n## Reservation {i}\n"
+            f"Reservation Number: {get('reservationnumber')}\n"
+            f"Customer: {get('customername')} {get('customersurname')}\n"
+            f"Contact: {get('customeremail')}, {get('customertel')}\n"
+            f"Passengers: {get('adult')} adults, {get('child')} children, {get('infant')} infants\n"
+            f"Amount: {get('Amount')} {get('currency')}\n"
+            f"Status: {get('status')}\n"
+            f"Payment: {get('paymenttype')}\n"
+            f"Created: {get('createat')}"
+        )
         
         # Show transfer ways
-        ways = res.get("ways", [])
-        response_parts.append("\nTransfers:")
-        for j, way in enumerate(ways, 1):
+        append("\nTransfers:")
+        for j, way in enumerate(get("ways", []), 1):
+            way_get = way.get
             dir_text = "Outbound" if j == 1 else "Return"
-            response_parts.append(f"- {dir_text}: {way.get('pickupadres')} → {way.get('returnadres')}")
-            response_parts.append(f"  Date: {way.get('flightdate')}, Pickup time: {way.get('pickuptime')}")
-            response_parts.append(f"  Vehicle: {way.get('car')}, Duration: {way.get('duration')} min")
-            if way.get('flightnumber'):
-                response_parts.append(f"  Flight: {way.get('flightnumber')}, Terminal: {way.get('terminal')}")
+            append(
+                f"- {dir_text}: {way_get('pickupadres')} → {way_get('returnadres')}\n"
+                f"  Date: {way_get('flightdate')}, Pickup time: {way_get('pickuptime')}\n"
+                f"  Vehicle: {way_get('car')}, Duration: {way_get('duration')} min"
+            )
+            flight_number = way_get('flightnumber')
+            if flight_number:
+                append(f"  Flight: {flight_number}, Terminal: {way_get('terminal')}")
         
         # Show passengers
-        passengers = res.get("passangers", [])
+        passengers = get("passangers", [])
         if passengers:
-            response_parts.append("\nPassengers:")
+            append("\nPassengers:")
             for passenger in passengers:
-                response_parts.append(f"- {passenger.get('namesurname')} ({passenger.get('country')})")
+                append(f"- {passenger.get('namesurname')} ({passenger.get('country')})")
     
     return "\n".join(response_parts)
 